@@ -2,939 +2,1003 @@
 #  You should have received a copy of this as "LICENSE" with this source distribution. The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
 
 #vim: set ts=4 st=4 sw=4 expandtab
-from .constants import FILTER_TYPES
+from .constants import FILTER_TYPES, FILTER_METHOD_AND, FILTER_METHOD_OR
 
+import operator
 import re
 
-__all__ = ('FILTER_PARAM_RE', 'getFiltersFromArgs', 'QueryableListBase')
+__all__ = ('FILTER_PARAM_RE', 'getFiltersFromArgs', 'QueryableListBase', 'QueryableListIterator')
 
 FILTER_PARAM_RE = re.compile('^(?P<field>.+)__(?P<filterType>.+)$')
 
-'''
-    USE_CACHED - Set to True to cache field values on the items.
+# _PARSED_FILTER_KEYS - Cache of filter argument key -> (fieldName, filterType), as applications tend to
+#   repeat the same queries. Cleared if it ever grows past _PARSED_FILTER_KEYS_MAX entries.
+_PARSED_FILTER_KEYS = {}
+_PARSED_FILTER_KEYS_MAX = 2048
 
-      I don't notice any performance difference with this on or off,
-        so best to leave it False for now.
-'''
-USE_CACHED = False
 
-
-def getFiltersFromArgs(kwargs):
+def _parseFilterKey(key):
     '''
-        getFiltersFromArgs - Returns a dictionary of each filter type, and the corrosponding field/value
+        _parseFilterKey - Split a filter argument key into its field name and filter type
 
-        @param kwargs <dict> - Dictionary of filter arguments
+        @param key <str> - A filter argument key, like "fieldName__operation" or just "fieldName"
 
+        @raises ValueError - If an operation is given which is not in FILTER_TYPES
 
-        @return - Dictionary of each filter type (minus the ones that are optimized into others), each containing a list of tuples, (fieldName, matchingValue)
+        @return tuple( <str>, <str> ) - ( fieldName, filterType ). If no operation is given, the filter type is "eq"
     '''
-
-    # Create a copy of each possible filter in FILTER_TYPES and link to empty list.
-    #  This object will be filled with all of the filters requested
-    ret = { filterType : list() for filterType in FILTER_TYPES }
-
-    for key, value in kwargs.items():
+    try:
+        return _PARSED_FILTER_KEYS[key]
+    except KeyError:
+        pass
+
+    # The field name is everything before the last "__", same as FILTER_PARAM_RE, but without running the regex.
+    (field, sep, filterType) = key.rpartition('__')
+    if not field or not filterType:
+        # No "__" in the key, or the odd cases of a leading or trailing "__" -- let FILTER_PARAM_RE decide.
         matchObj = FILTER_PARAM_RE.match(key)
         if not matchObj:
-
             # Default ( no __$oper) is eq
-            filterType = 'eq'
             field = key
-
+            filterType = 'eq'
         else:
-
-            # We have an operation defined, extract it, and optimize if possible
-            #  (like if op is a case-insensitive, lowercase the value here)
             groupDict = matchObj.groupdict()
 
-            filterType = groupDict['filterType']
             field = groupDict['field']
+            filterType = groupDict['filterType']
 
+    if filterType not in FILTER_TYPES:
+        raise ValueError('Unknown filter type: %s. Choices are: (%s)' %(filterType, ', '.join(FILTER_TYPES)))
 
-            if filterType not in FILTER_TYPES:
-                raise ValueError('Unknown filter type: %s. Choices are: (%s)' %(filterType, ', '.join(FILTER_TYPES)))
-
-
-            if filterType == 'isnull':
-                # Convert "isnull" to one of the "is" or "isnot" filters against None
-                if type(value) is not bool:
-                    raise ValueError('Filter type "isnull" requires True/False.')
-
-                if value is True:
-                    filterType = "is"
-                else:
-                    filterType = "isnot"
-
-                value = None
-            elif filterType in ('in', 'notin'):
-                # Try to make more efficient by making a set. Fallback to just using what they provide, could be an object implementing "in"
-                try:
-                    value = set(value)
-                except:
-                    pass
-            # Optimization - if case-insensitive, lowercase the comparison value here
-            elif filterType in ('ieq', 'ine', 'icontains', 'noticontains'):
-                value = value.lower()
-            elif filterType.startswith('split'):
-                if (not issubclass(type(value), tuple) and not issubclass(type(value), list)) or len(value) != 2:
-                    raise ValueError('Filter type %s expects a tuple of two params. (splitBy, matchPortion)' %(filterType,))
-
-
-
-        ret[filterType].append( (field, value) )
+    if len(_PARSED_FILTER_KEYS) >= _PARSED_FILTER_KEYS_MAX:
+        _PARSED_FILTER_KEYS.clear()
 
+    ret = _PARSED_FILTER_KEYS[key] = (field, filterType)
     return ret
 
 
-
-class QueryableListBase(list):
-    '''
-        QueryableListBase - The base implementation of a QueryableList. 
-
-        Any implementing classes should only have to implement the "_get_item_value(item, fieldName)" method, to return the value of a given field on an item.
-
-        You cannot use this directly, instead use one of the implementing classes (like QueryableListDicts or QueryableListObjs), or your own implementing class.
+def getFiltersFromArgs(kwargs):
     '''
+        getFiltersFromArgs - Returns a dictionary of each filter type, and the corrosponding field/value
 
-    def all(self):
-        '''
-            all - Returns all items in this collection, as the collection type (aka returns a copy of "self").
-
-              This method is provided for method parity with ORMs that build a filter set with filter calls,
-                and then execute with ".all" (like django or IndexedRedis).
-
-              That way you can filter and call ".all()" after, and it doesn't matter if you're hitting the db
-                or filtering already-fetched objects, the usage remains the same.
-
-            @return <self.__class__> - self
-        '''
-        return self.__class__(self)
-
-
-    @staticmethod
-    def _get_item_value(item, fieldName):
-        '''
-            _get_item_value - Must be implemented to complete a QueryableList. Returns the value of a given field on an item
-
-                @param item <???> - The item that needs a value fetched off it
-                @param fieldName <str> - The name of the field on that item which is being requested
-
-            @return - The value of the #fieldName attribute/key/whatever on #item
+        @param kwargs <dict> - Dictionary of filter arguments
 
-        '''
-        raise NotImplementedError('QueryableList type must implement _get_item_value')
 
+        @return - Dictionary of each filter type (minus the ones that are optimized into others), each containing a list of tuples, (fieldName, matchingValue)
+    '''
 
-    def _getItemValueFunction(self, caches, _get_item_value):
+    # Create a copy of each possible filter in FILTER_TYPES and link to empty list.
+    #  This object will be filled with all of the filters requested
+    ret = { filterType : list() for filterType in FILTER_TYPES }
 
-        _i = ctypes.c_int()
+    for key, value in kwargs.items():
+        (field, filterType) = _parseFilterKey(key)
 
-        maxI = len(caches)
+        if filterType == 'isnull':
+            # Convert "isnull" to one of the "is" or "isnot" filters against None
+            if type(value) is not bool:
+                raise ValueError('Filter type "isnull" requires True/False.')
 
-        def _getItemValue_impl(item, fieldName):
-            i = _i.value
-            cache = caches[i]
-            _i.value += 1
-            if i >= maxI:
-                _i.value = 0
+            if value is True:
+                filterType = "is"
             else:
-                _i.value = i
+                filterType = "isnot"
+
+            value = None
+        elif filterType in ('in', 'notin'):
+            # Try to make more efficient by making a set. Fallback to just using what they provide, could be an object implementing "in"
+            try:
+                value = frozenset(value)
+            except:
+                pass
+        elif filterType in ('containsAny', 'notcontainsAny'):
+            # Convert once here, rather than iterating whatever was provided (could be a generator) for every item.
+            #   If it is not iterable, leave it be, the error surfaces only if an item is actually tested against it.
+            try:
+                value = tuple(value)
+            except:
+                pass
+        # Optimization - if case-insensitive, lowercase the comparison value here
+        elif filterType in ('ieq', 'ine', 'icontains', 'noticontains'):
+            value = value.lower()
+        elif filterType.startswith('split'):
+            if (not issubclass(type(value), tuple) and not issubclass(type(value), list)) or len(value) != 2:
+                raise ValueError('Filter type %s expects a tuple of two params. (splitBy, matchPortion)' %(filterType,))
 
-            if fieldName in cache:
-                val = cache[fieldName]
-            else:
-                val = _get_item_value(item, fieldName)
-                cache[fieldName] = val
-            return val
+        ret[filterType].append( (field, value) )
 
-        return _getItemValue_impl
+    return ret
 
-    def customFilter(self, filterFunc):
-        '''
-            customFilter - Apply a custom filter to elements and return a QueryableList of matches
 
-            @param filterFunc <lambda/function< - A lambda/function that is passed an item, and
-               returns True if the item matches (will be returned), otherwise False.
 
-            @return - A QueryableList object of the same type, with only the matching objects returned.
-        '''
-        ret = self.__class__()
-        for item in self:
-            if filterFunc(item):
-                ret.append(item)
+# The following functions each test a single filter against the value of a field on an item.
+#   They take the field's value off the item, and the (already prepared) value from the filter,
+#   and return True if the item matches that filter.
 
-        return ret
-                
+# These comparisons map directly onto the C-implemented functions in the operator module,
+#   which saves a python-level call for every item tested.
+_matchIs = operator.is_
+_matchIsNot = operator.is_not
+_matchEq = operator.eq
+_matchNe = operator.ne
+_matchLt = operator.lt
+_matchLte = operator.le
+_matchGt = operator.gt
+_matchGte = operator.ge
 
-    def count(self):
-        '''
-            count - Returns the number of items in this collection.
+# AND filters have always rejected an item when the opposite comparison is true (eq rejects on "!=", lt on ">=", etc.),
+#   rather than keeping it when the comparison is true. The two differ for values which are not totally ordered
+#   (like NaN or sets), and on python 2 for classes which only define __eq__, so AND uses these instead.
+def _matchEqAnd(itemValue, value):
+    return not (itemValue != value)
 
-                This is the same as len(...), but is added to be compatible with many server-side ORMs which implement "count" as a function.
-
-              @return <int> - Number of items in this collection
-        '''
-        return len(self)
+def _matchNeAnd(itemValue, value):
+    return not (itemValue == value)
 
+def _matchLtAnd(itemValue, value):
+    return not (itemValue >= value)
 
-    def sort_by(self, fieldName, reverse=False):
-        '''
-            sort_by - Return a copy of this collection, sorted by the given fieldName.
+def _matchLteAnd(itemValue, value):
+    return not (itemValue > value)
 
-              The fieldName is accessed the same way as other filtering, so it supports custom properties, etc.
+def _matchGtAnd(itemValue, value):
+    return not (itemValue <= value)
 
-              @param fieldName <str> - The name of the field on which to sort by
+def _matchGteAnd(itemValue, value):
+    return not (itemValue < value)
 
-              @param reverse <bool> Default False - If True, list will be in reverse order.
+def _matchCustom(itemValue, matchFunc):
+    return matchFunc(itemValue)
 
-              @return <QueryableList> - A QueryableList of the same type with the elements sorted based on arguments.
-        '''
-        return self.__class__(
-            sorted(self, key = lambda item : self._get_item_value(item, fieldName), reverse=reverse)
-        )
+def _matchIn(itemValue, value):
+    return itemValue in value
 
+def _matchNotIn(itemValue, value):
+    return itemValue not in value
 
-    def filterAnd(self, **kwargs):
-        '''
-            filter/filterAnd - Performs a filter and returns a QueryableList object of the same type.
+# The case-insensitive and contains matchers check for None (a missing field) up front, as raising and catching
+#   the exception from None.lower() or "in None" costs many times more than the test itself.
 
-                All the provided filters must match for the item to be returned.
+def _matchIeq(itemValue, value):
+    # If we can't lowercase the item's value, it obviously doesn't match whatever we previously could.
+    # Reminder: the "i" filter's values have already been lowercased
+    if itemValue is None:
+        return False
 
-            @params are in the format of fieldName__operation=value  where fieldName is the name of the field on any given item, "operation" is one of the given operations (@see main documentation) (e.x. eq, ne, isnull), and value is what is used in the operation.
+    try:
+        itemValueLower = itemValue.lower()
+    except:
+        return False
 
-            @return - A QueryableList object of the same type, with only the matching objects returned.
-        '''
-        filters = getFiltersFromArgs(kwargs)
-        ret = self.__class__()
+    return itemValueLower == value
 
-        if USE_CACHED:
-            caches = [dict() for i in range(len(self))]
-            get_item_value = self._getItemValueFunction(caches, self._get_item_value)
-        else:
-            get_item_value = self._get_item_value
+def _matchIne(itemValue, value):
+    if itemValue is None:
+        return True
 
-        # AND loop - for each item in this collection, run through each of the filter types.
-        # If any of the filter types do not match, move on to next item
-        # If all filters match, add item to the return set
-        for item in self:
-            keepIt = True
+    try:
+        itemValueLower = itemValue.lower()
+    except:
+        # If we can't convert the field value to lowercase, it does not equal the other.
+        return True
 
-            # Do is/isnot first (and implicitly, isnull)
-            for fieldName, value in filters['is']:
-                if get_item_value(item, fieldName) is not value:
-                    keepIt = False
-                    break
+    return itemValueLower != value
 
-            if keepIt is False:
-                continue
+def _matchIneOr(itemValue, value):
+    # Same as _matchIne, except an OR filter has never counted a field which cannot be lowercased as a match.
+    if itemValue is None:
+        return False
 
-            for fieldName, value in filters['isnot']:
-                if get_item_value(item, fieldName) is value:
-                    keepIt = False
-                    break
+    try:
+        itemValueLower = itemValue.lower()
+    except:
+        return False
 
-            if keepIt is False:
-                continue
+    return itemValueLower != value
 
-            for fieldName, matchFunc in filters['customMatch']:
-                val = get_item_value(item, fieldName)
-                if not matchFunc(val):
-                    keepIt = False
-                    break
+def _matchContains(itemValue, value):
+    if itemValue is None:
+        return False
 
-            if keepIt is False:
-                continue
+    try:
+        return value in itemValue
+    except:
+        # If field does not support "in", it does not contain the item.
+        return False
 
-            for fieldName, value in filters['in']:
-                if get_item_value(item, fieldName) not in value:
-                    keepIt = False
-                    break
+def _matchIcontains(itemValue, value):
+    if itemValue is None:
+        return False
+
+    try:
+        return value in itemValue.lower()
+    except:
+        return False
+
+def _matchNotContains(itemValue, value):
+    if itemValue is None:
+        return True
+
+    try:
+        return value not in itemValue
+    except:
+        # If field does not support "in", it does not contain the item.
+        return True
+
+def _matchNotIcontains(itemValue, value):
+    if itemValue is None:
+        return True
+
+    try:
+        return value not in itemValue.lower()
+    except:
+        return True
+
+# _SET_TYPES - When a field value is exactly one of these, containsAny/notcontainsAny can test
+#   all the provided values at once with isdisjoint instead of a python-level loop.
+_SET_TYPES = (set, frozenset)
+
+def _matchContainsAny(itemValue, value):
+    if itemValue is None:
+        # None contains nothing, no match
+        return False
+
+    if type(itemValue) in _SET_TYPES:
+        return not itemValue.isdisjoint(value)
+
+    for maybeContains in value:
+        if maybeContains in itemValue:
+            return True
+    return False
+
+def _matchNotContainsAny(itemValue, value):
+    if itemValue is None:
+        # None contains nothing, so this is a match
+        return True
+
+    if type(itemValue) in _SET_TYPES:
+        return itemValue.isdisjoint(value)
+
+    for maybeContains in value:
+        if maybeContains in itemValue:
+            return False
+    return True
+
+# IDEA: Could implement a dict here of last several splits, incase we have repeated splits on same large field.
+#   I think this may be more lossy in the general case to support a corner case though.
+
+def _matchSplitContains(itemValue, value):
+    (splitBy, maybeContains) = value
+
+    if itemValue is None:
+        # Cannot split, no match
+        return False
+
+    try:
+        return maybeContains in itemValue.split(splitBy)
+    except:
+        # If field does not supprt "in", or cannot be split, it does not contain the item.
+        return False
+
+def _matchSplitNotContains(itemValue, value):
+    (splitBy, maybeContains) = value
+
+    if itemValue is None:
+        # Cannot split, so does not contain and is a match.
+        return True
+
+    try:
+        return maybeContains not in itemValue.split(splitBy)
+    except:
+        # If field does not supprt "in", or cannot be split, it does not contain the item and thus matches here.
+        return True
+
+def _matchSplitContainsAny(itemValue, value):
+    (splitBy, maybeContainsLst) = value
+
+    if itemValue is None:
+        # Cannot split, so it does not contain a match
+        return False
+
+    try:
+        itemValue = itemValue.split(splitBy)
+    except:
+        # Cannot split, does not match.
+        return False
+
+    for maybeContains in maybeContainsLst:
+        if maybeContains in itemValue:
+            return True
+    return False
+
+def _matchSplitNotContainsAny(itemValue, value):
+    (splitBy, maybeContainsLst) = value
+
+    if itemValue is None:
+        # Cannot split, so it must not contain any (and is a match)
+        return True
+
+    try:
+        itemValue = itemValue.split(splitBy)
+    except:
+        # Cannot split, so must not contain any (and is a match)
+        return True
+
+    for maybeContains in maybeContainsLst:
+        if maybeContains in itemValue:
+            return False
+    return True
+
+
+# _FILTER_MATCHERS - Map of each filter type to the function which tests if an item's field value matches it, used by filterAnd.
+#   "isnull" is not present, as getFiltersFromArgs converts it into an "is" or "isnot" filter.
+_FILTER_MATCHERS = {
+    'is'                  : _matchIs,
+    'isnot'               : _matchIsNot,
+    'customMatch'         : _matchCustom,
+    'in'                  : _matchIn,
+    'notin'               : _matchNotIn,
+    'eq'                  : _matchEqAnd,
+    'ieq'                 : _matchIeq,
+    'ne'                  : _matchNeAnd,
+    'ine'                 : _matchIne,
+    'lt'                  : _matchLtAnd,
+    'lte'                 : _matchLteAnd,
+    'gt'                  : _matchGtAnd,
+    'gte'                 : _matchGteAnd,
+    'contains'            : _matchContains,
+    'icontains'           : _matchIcontains,
+    'notcontains'         : _matchNotContains,
+    'noticontains'        : _matchNotIcontains,
+    'containsAny'         : _matchContainsAny,
+    'notcontainsAny'      : _matchNotContainsAny,
+    'splitcontains'       : _matchSplitContains,
+    'splitnotcontains'    : _matchSplitNotContains,
+    'splitcontainsAny'    : _matchSplitContainsAny,
+    'splitnotcontainsAny' : _matchSplitNotContainsAny,
+}
+
+# _FILTER_MATCHERS_OR - The matchers used by filterOr, which keep an item when the comparison itself is true,
+#   and differ on "ine"
+_FILTER_MATCHERS_OR = dict(_FILTER_MATCHERS)
+_FILTER_MATCHERS_OR.update( {
+    'eq'  : _matchEq,
+    'ne'  : _matchNe,
+    'lt'  : _matchLt,
+    'lte' : _matchLte,
+    'gt'  : _matchGt,
+    'gte' : _matchGte,
+    'ine' : _matchIneOr,
+} )
+
+# _FILTER_ORDER - The order in which the filter types are applied, cheapest first.
+#   Identity and equality tests come first, then customMatch and hashed membership, then the case-insensitive
+#   tests (which lowercase every value), then ordering comparisons, then the substring and split scans.
+#
+#   Some filters can raise for some field values (customMatch runs the user's function, "in" needs a hashable value,
+#     lt/lte/gt/gte need comparable values, containsAny needs a value supporting "in"). Each of these still runs after
+#     every filter type it did originally, so that queries relying on an earlier filter to exclude such values
+#     (like customMatch=lambda x : x is not None, ieq=..., with lt=...) keep working. Only filters which cannot raise
+#     have been moved ahead.
+#
+#   Each item stops being tested at the first filter which fails (AND) or matches (OR), so the cheap filters
+#     up front spare most items from the more expensive ones.
+_FILTER_ORDER = ('is', 'isnot', 'eq', 'ne', 'customMatch', 'in', 'notin', 'ieq', 'ine', 'lt', 'lte', 'gt', 'gte',
+    'contains', 'notcontains', 'icontains', 'noticontains', 'containsAny', 'notcontainsAny',
+    'splitcontains', 'splitnotcontains', 'splitcontainsAny', 'splitnotcontainsAny')
+
+
+# _INLINE_MATCHES - Expressions which generated OR filter functions (@see _compileFilter) use in place of calling
+#   these matchers, to save a call for every item. %(itemValue)s and %(value)s are replaced by the expressions yielding each.
+_INLINE_MATCHES = {
+    _matchIs     : '%(itemValue)s is %(value)s',
+    _matchIsNot  : '%(itemValue)s is not %(value)s',
+    _matchIn     : '%(itemValue)s in %(value)s',
+    _matchNotIn  : '%(itemValue)s not in %(value)s',
+    _matchEq     : '%(itemValue)s == %(value)s',
+    _matchNe     : '%(itemValue)s != %(value)s',
+    _matchLt     : '%(itemValue)s < %(value)s',
+    _matchLte    : '%(itemValue)s <= %(value)s',
+    _matchGt     : '%(itemValue)s > %(value)s',
+    _matchGte    : '%(itemValue)s >= %(value)s',
+}
+
+# _INLINE_REJECTS - Expressions which generated AND filter functions use in place of calling these matchers. Each is
+#   true when the item does not match, and is the same test the matcher negates (@see _matchEqAnd).
+_INLINE_REJECTS = {
+    _matchIs     : '%(itemValue)s is not %(value)s',
+    _matchIsNot  : '%(itemValue)s is %(value)s',
+    _matchIn     : '%(itemValue)s not in %(value)s',
+    _matchNotIn  : '%(itemValue)s in %(value)s',
+    _matchEqAnd  : '%(itemValue)s != %(value)s',
+    _matchNeAnd  : '%(itemValue)s == %(value)s',
+    _matchLtAnd  : '%(itemValue)s >= %(value)s',
+    _matchLteAnd : '%(itemValue)s > %(value)s',
+    _matchGtAnd  : '%(itemValue)s <= %(value)s',
+    _matchGteAnd : '%(itemValue)s < %(value)s',
+}
+
+# _INLINE_STR_MATCHES - Like _INLINE_MATCHES, but only used when both the field value and the filter value are exactly str,
+#   (the common case, where "in" is a plain substring search that cannot raise). Any other field value calls the matcher.
+_INLINE_STR_MATCHES = {
+    _matchContains    : '%(value)s in %(itemValue)s',
+    _matchNotContains : '%(value)s not in %(itemValue)s',
+}
+
+# _COMPILED_FILTERS - Cache of ( filterMethod, tuple of match functions, field slots, isGenerator ) -> generated filter function.
+#   Cleared if it ever grows past _COMPILED_FILTERS_MAX entries.
+_COMPILED_FILTERS = {}
+_COMPILED_FILTERS_MAX = 256
+
+
+def _compileFilter(filterMethod, matchFuncs, fieldSlots, isGenerator=False):
+    '''
+        _compileFilter - Generate a function which applies a filter of the given shape.
 
-            if keepIt is False:
-                continue
+            The generated function tests each item against each filter in order with straight-line code,
+              and stops at the first filter that does not match (AND) or does match (OR).
+              Simple comparisons (@see _INLINE_MATCHES, and _INLINE_REJECTS for AND) are written inline, others call their matcher.
+              contains/notcontains are written inline for str values (@see _INLINE_STR_MATCHES).
+              When several filters are on the same field, its value is fetched once per item and shared between them.
 
-            for fieldName, value in filters['notin']:
-                if get_item_value(item, fieldName) in value:
-                    keepIt = False
-                    break
+            Only the structure comes from #matchFuncs, the filter values are passed in when called,
+              so any query with the same filter types in the same order can reuse the function.
 
-            if keepIt is False:
-                continue
+            @param filterMethod <str> - FILTER_METHOD_AND or FILTER_METHOD_OR
+            @param matchFuncs tuple<function> - The match function of each filter, in the order to apply them
+            @param fieldSlots tuple<int> - For each filter, the index of the first filter on the same field (@see _getFieldSlots)
+            @param isGenerator <bool> Default False - If True, the generated function yields each matching item rather than returning a list
 
+        @return <function(items, matchers, getters, values)> - Function returning a list of the matching items (or a generator of them),
+          where each param after items is a tuple with an entry per filter in #matchFuncs
+    '''
+    numFilters = len(matchFuncs)
+
+    unpackNames = lambda prefix : ', '.join( [ '%s%d' %(prefix, i) for i in range(numFilters) ] )
+
+    lines = [
+        'def _filterItems(items, matchers, getters, values):',
+        '    (%s, ) = matchers' %(unpackNames('m'), ),
+        '    (%s, ) = getters' %(unpackNames('g'), ),
+        '    (%s, ) = values' %(unpackNames('v'), ),
+    ]
+
+    for i, matchFunc in enumerate(matchFuncs):
+        if matchFunc in _INLINE_STR_MATCHES:
+            lines.append('    s%d = type(v%d) is str' %(i, i))
+
+    if isGenerator:
+        keepItem = 'yield item'
+    else:
+        keepItem = 'retAppend(item)'
+        # NOTE: Appending to an empty list measures faster than preallocating [None] * len(items), storing by
+        #   a counter and truncating at the end (for both few and most items matching), so stick with append.
+        lines += [
+            '    ret = []',
+            '    retAppend = ret.append',
+        ]
+
+    lines.append('    for item in items:')
+
+    for i, matchFunc in enumerate(matchFuncs):
+        fieldSlot = fieldSlots[i]
+        if fieldSlot != i:
+            # An earlier filter already fetched this field. Every item reaching this filter has passed through
+            #   that one (AND stops at the first miss, OR at the first match), so x<fieldSlot> is always set.
+            itemValue = 'x%d' %(fieldSlot, )
+        elif matchFunc in _INLINE_STR_MATCHES or fieldSlots.count(i) > 1:
+            # Fetch the field value once, as it is used more than once (in a type check, or by a later filter)
+            lines.append('        x%d = g%d(item)' %(i, i))
+            itemValue = 'x%d' %(i, )
+        else:
+            itemValue = 'g%d(item)' %(i, )
+
+        names = { 'itemValue' : itemValue, 'value' : 'v%d' %(i, ) }
+        if filterMethod == FILTER_METHOD_AND and matchFunc in _INLINE_REJECTS:
+            lines += [
+                '        if %s:' %(_INLINE_REJECTS[matchFunc] %names, ),
+                '            continue',
+            ]
+            continue
+
+        if matchFunc in _INLINE_MATCHES:
+            matchExpr = _INLINE_MATCHES[matchFunc] %names
+        elif matchFunc in _INLINE_STR_MATCHES:
+            matchExpr = '(%s) if (s%d and type(%s) is str) else m%d(%s, v%d)' %(_INLINE_STR_MATCHES[matchFunc] %names, i, itemValue, i, itemValue, i)
+        else:
+            matchExpr = 'm%d(%s, %s)' %(i, names['itemValue'], names['value'])
 
-            for fieldName, value in filters['eq']:
-                if get_item_value(item, fieldName) != value:
-                    keepIt = False
-                    break
+        if filterMethod == FILTER_METHOD_AND:
+            lines += [
+                '        if not (%s):' %(matchExpr, ),
+                '            continue',
+            ]
+        else:
+            lines += [
+                '        if %s:' %(matchExpr, ),
+                '            ' + keepItem,
+                '            continue',
+            ]
 
-            if keepIt is False:
-                continue
+    if filterMethod == FILTER_METHOD_AND:
+        lines.append('        ' + keepItem)
 
-            for fieldName, value in filters['ieq']:
-                # If we can't lowercase the item's value, it obviously doesn't match whatever we previously could.
-                # Reminder: the "i" filter's values have already been lowercased
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    keepIt = False
-                    break
+    if not isGenerator:
+        lines.append('    return ret')
 
-                if itemValueLower != value:
-                    keepIt = False
-                    break
+    namespace = {}
+    exec(compile('\n'.join(lines) + '\n', '<QueryableList %s filter>' %(filterMethod, ), 'exec'), namespace)
 
-            if keepIt is False:
-                continue
+    return namespace['_filterItems']
 
-            for fieldName, value in filters['ne']:
-                if get_item_value(item, fieldName) == value:
-                    keepIt = False
-                    break
+def _getFieldSlots(getters):
+    '''
+        _getFieldSlots - Find which filters are on the same field, so the generated filter can fetch each field only once per item.
 
-            if keepIt is False:
-                continue
+            @param getters tuple<function> - The field getter of each filter. Filters on the same field share the same getter (@see QueryableListBase._get_filter_plan)
 
-            for fieldName, value in filters['ine']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    # If we can't convert the field value to lowercase, it does not equal the other.
-                    continue
+        @return tuple<int> - For each filter, the index of the first filter with the same getter
+    '''
+    firstIdxs = {}
+    return tuple( [ firstIdxs.setdefault(getter, i) for i, getter in enumerate(getters) ] )
 
-                if itemValueLower == value:
-                    keepIt = False
-                    break
+def _getCompiledFilter(filterMethod, matchFuncs, fieldSlots, isGenerator=False):
+    '''
+        _getCompiledFilter - Returns the generated function for a filter of this shape, from cache if possible.
 
-            if keepIt is False:
-                continue
+        @see _compileFilter
+    '''
+    key = (filterMethod, matchFuncs, fieldSlots, isGenerator)
+    try:
+        return _COMPILED_FILTERS[key]
+    except KeyError:
+        pass
 
-            for fieldName, value in filters['lt']:
-                if get_item_value(item, fieldName) >= value:
-                    keepIt = False
-                    break
+    if len(_COMPILED_FILTERS) >= _COMPILED_FILTERS_MAX:
+        _COMPILED_FILTERS.clear()
 
-            if keepIt is False:
-                continue
+    ret = _COMPILED_FILTERS[key] = _compileFilter(filterMethod, matchFuncs, fieldSlots, isGenerator)
+    return ret
 
-            for fieldName, value in filters['lte']:
-                if get_item_value(item, fieldName) > value:
-                    keepIt = False
-                    break
 
-            if keepIt is False:
-                continue
+def _filterItemsAnd(items, filterPlan):
+    '''
+        _filterItemsAnd - Returns a list of the items which match every filter in #filterPlan
 
-            for fieldName, value in filters['gt']:
-                if get_item_value(item, fieldName) <= value:
-                    keepIt = False
-                    break
+            @param items <list> - The items to filter
+            @param filterPlan <list> - The filters to apply, @see QueryableListBase._get_filter_plan
 
-            if keepIt is False:
-                continue
+        @return <list> - The matching items, in their original order
+    '''
+    if not filterPlan:
+        return list(items)
 
+    (matchers, getters, values) = zip(*filterPlan)
 
-            for fieldName, value in filters['gte']:
-                if get_item_value(item, fieldName) < value:
-                    keepIt = False
-                    break
+    return _getCompiledFilter(FILTER_METHOD_AND, matchers, _getFieldSlots(getters))(items, matchers, getters, values)
 
-            if keepIt is False:
-                continue
+def _filterItemsOr(items, filterPlan):
+    '''
+        _filterItemsOr - Returns a list of the items which match any filter in #filterPlan
 
-            for fieldName, value in filters['contains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value not in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    keepIt = False
-                    break
+            @param items <list> - The items to filter
+            @param filterPlan <list> - The filters to apply, @see QueryableListBase._get_filter_plan
 
-            if keepIt is False:
-                continue
+        @return <list> - The matching items, in their original order
+    '''
+    if not filterPlan:
+        return []
 
-            for fieldName, value in filters['icontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
+    (matchers, getters, values) = zip(*filterPlan)
 
-                    if value not in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    keepIt = False
-                    break
+    return _getCompiledFilter(FILTER_METHOD_OR, matchers, _getFieldSlots(getters))(items, matchers, getters, values)
 
-            if keepIt is False:
-                continue
+def _ifilterItems(filterMethod, items, filterPlan):
+    '''
+        _ifilterItems - Returns an iterator over the items which match #filterPlan, testing each item only as it is requested
 
-            for fieldName, value in filters['notcontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    continue
-
-            if keepIt is False:
-                continue
+            @param filterMethod <str> - FILTER_METHOD_AND or FILTER_METHOD_OR
+            @param items <iterable> - The items to filter
+            @param filterPlan <list> - The filters to apply, @see QueryableListBase._get_filter_plan
 
-            for fieldName, value in filters['noticontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
+        @return <iterator> - The matching items, in their original order
+    '''
+    if not filterPlan:
+        if filterMethod == FILTER_METHOD_AND:
+            return iter(items)
+        return iter(())
 
-                    if value in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    continue
+    (matchers, getters, values) = zip(*filterPlan)
 
+    return _getCompiledFilter(filterMethod, matchers, _getFieldSlots(getters), True)(items, matchers, getters, values)
 
-            if keepIt is False:
-                continue
 
-            for fieldName, value in filters['containsAny']:
-                itemValue = get_item_value(item, fieldName)
+def _filterAndChunk(args):
+    '''
+        _filterAndChunk - Worker for QueryableListBase.filterAndParallel, run in a child process.
 
-                if itemValue is None:
-                    # Cannot split None
-                    keepIt = False
-                    break
+            @param args <tuple> - ( queryableListClass, items, firstIdx, kwargs )
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is False:
-                    keepIt = False
-                    break
+        @return list<int> - The indexes (into the full collection) of the items in this chunk which matched
+    '''
+    (queryableListClass, items, firstIdx, kwargs) = args
 
-            if keepIt is False:
-                continue
+    qlItems = queryableListClass(items)
+    matches = _filterItemsAnd(qlItems, qlItems._get_filter_plan(getFiltersFromArgs(kwargs), _FILTER_MATCHERS))
 
-            for fieldName, value in filters['notcontainsAny']:
-                itemValue = get_item_value(item, fieldName)
+    # The items were copied into this process, so report back their positions instead of the items themselves
+    matchIds = set( id(item) for item in matches )
 
-                if itemValue is None:
-                    # Cannot split None, so it is a match..
-                    continue
+    return [ firstIdx + idx for idx, item in enumerate(items) if id(item) in matchIds ]
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is True:
-                    keepIt = False
-                    break
 
-            if keepIt is False:
-                continue
 
-            # IDEA: Could implement a dict here of last several splits, incase we have repeated splits on same large field.
-            #   I think this may be more lossy in the general case to support a corner case though.
+class QueryableListBase(list):
+    '''
+        QueryableListBase - The base implementation of a QueryableList. 
 
-            for fieldName, value in filters['splitcontains']:
-                (splitBy, maybeContains) = value
+        Any implementing classes should only have to implement the "_get_item_value(item, fieldName)" method, to return the value of a given field on an item.
 
-                itemValue = get_item_value(item, fieldName)
+        You cannot use this directly, instead use one of the implementing classes (like QueryableListDicts or QueryableListObjs), or your own implementing class.
+    '''
 
-                if itemValue is None:
-                    # Cannot split, no match
-                    keepIt = False
-                    break
+    # _indexes - Set by #build_index to a dict of fieldName -> { value : [ list of indexes of the items with that value ] }
+    _indexes = None
+    # _indexedItems - Set by #build_index to a copy of the items when the indexes were built, @see #_get_indexes
+    _indexedItems = None
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains not in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item.
-                    keepIt = False
-                    break
+    def all(self):
+        '''
+            all - Returns all items in this collection, as the collection type (aka returns a copy of "self").
 
-            if keepIt is False:
-                continue
+              This method is provided for method parity with ORMs that build a filter set with filter calls,
+                and then execute with ".all" (like django or IndexedRedis).
 
-            for fieldName, value in filters['splitnotcontains']:
-                (splitBy, maybeContains) = value
+              That way you can filter and call ".all()" after, and it doesn't matter if you're hitting the db
+                or filtering already-fetched objects, the usage remains the same.
 
-                itemValue = get_item_value(item, fieldName)
+            @return <self.__class__> - self
+        '''
+        return self.__class__(self)
 
-                if itemValue is None:
-                    # Cannot split, so does not contain and is a match.
-                    continue
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains in itemValue:
-                        keepIt = False
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item and thus matches here.
-                    continue
-
-            if keepIt is False:
-                continue
+    @staticmethod
+    def _get_item_value(item, fieldName):
+        '''
+            _get_item_value - Must be implemented to complete a QueryableList. Returns the value of a given field on an item
 
-            for fieldName, value in filters['splitcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+                @param item <???> - The item that needs a value fetched off it
+                @param fieldName <str> - The name of the field on that item which is being requested
 
-                itemValue = get_item_value(item, fieldName)
+            @return - The value of the #fieldName attribute/key/whatever on #item
 
-                if itemValue is None:
-                    # Cannot split, so it does not contain a match
-                    keepIt = False
-                    break
+        '''
+        raise NotImplementedError('QueryableList type must implement _get_item_value')
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, does not match.
-                    keepIt = False
-                    break
 
+    def _get_field_getter(self, fieldName):
+        '''
+            _get_field_getter - Returns a function which takes an item, and returns the value of #fieldName on that item.
 
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is False:
-                    keepIt = False
-                    break
+                This is used when filtering, so the field name does not have to be passed through #_get_item_value for every item.
+                The default wraps #_get_item_value, but implementing classes may override it with something faster.
 
-            if keepIt is False:
-                continue
+                @param fieldName <str> - The name of the field which will be requested
 
-            for fieldName, value in filters['splitnotcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+            @return <function(item)> - A function which returns the value of #fieldName on the given item
+        '''
+        get_item_value = self._get_item_value
 
-                itemValue = get_item_value(item, fieldName)
+        return lambda item : get_item_value(item, fieldName)
 
-                if itemValue is None:
-                    # Cannot split, so it must not contain any (and is a match)
-                    continue
+    def _get_filter_plan(self, filters, matchers):
+        '''
+            _get_filter_plan - Flattens #filters into the list of individual filters to apply, in the order to apply them (@see _FILTER_ORDER)
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, so must not contain any (and is a match)
-                    continue
-
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is True:
-                    keepIt = False
-                    break
+                @param filters <dict> - Filters, as returned by getFiltersFromArgs
+                @param matchers <dict> - Map of filter type -> match function (_FILTER_MATCHERS or _FILTER_MATCHERS_OR)
 
-            if keepIt is False:
+            @return list< tuple(matchFunc, getter, value) > - One entry for each filter requested, where getter fetches the field
+              from an item (@see #_get_field_getter), and matchFunc(getter(item), value) returns True if the item matches.
+        '''
+        plan = []
+        getters = {}
+        for filterType in _FILTER_ORDER:
+            filterValues = filters[filterType]
+            if not filterValues:
                 continue
 
-            # All the way through all filters, the item matches.
-            ret.append(item)
-
-        return ret
+            matchFunc = matchers[filterType]
+            for fieldName, value in filterValues:
+                try:
+                    getter = getters[fieldName]
+                except KeyError:
+                    getter = getters[fieldName] = self._get_field_getter(fieldName)
 
+                plan.append( (matchFunc, getter, value) )
 
-    '''
-        filter - Synonym to '#filterAnd'
+        return plan
 
-        @see #QueryableListBase.filterAnd
-    '''
-    filter = filterAnd
-
-    def filterOr(self, **kwargs):
+    def customFilter(self, filterFunc):
         '''
-            filterOr - Performs a filter and returns a QueryableList object of the same type.
-
-                Anythe provided filters can match for the item to be returned.
+            customFilter - Apply a custom filter to elements and return a QueryableList of matches
 
-            @params are in the format of fieldName__operation=value  where fieldName is the name of the field on any given item, "operation" is one of the given operations (@see main documentation) (e.x. eq, ne, isnull), and value is what is used in the operation.
+            @param filterFunc <lambda/function< - A lambda/function that is passed an item, and
+               returns True if the item matches (will be returned), otherwise False.
 
             @return - A QueryableList object of the same type, with only the matching objects returned.
         '''
-        filters = getFiltersFromArgs(kwargs)
         ret = self.__class__()
-
-        if USE_CACHED:
-            caches = [dict() for i in range(len(self))]
-            get_item_value = self._getItemValueFunction(caches, self._get_item_value)
-        else:
-            get_item_value = self._get_item_value
-
-        # OR filtering - For each item in the collection
-        #   Run through each filter type. If anything matches, we add the item to the collection and continue
-        #   If we get to the end without a match, we continue to next item
         for item in self:
-            keepIt = False
-
-            # Do is/isnot (and implicitly isnull) first.
-            for fieldName, value in filters['is']:
-                if get_item_value(item, fieldName) is value:
-                    keepIt = True
-                    break
-
-            if keepIt is True:
+            if filterFunc(item):
                 ret.append(item)
-                continue
 
-            for fieldName, value in filters['isnot']:
-                if get_item_value(item, fieldName) is not value:
-                    keepIt = True
-                    break
+        return ret
+                
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+    def count(self):
+        '''
+            count - Returns the number of items in this collection.
 
-            for fieldName, matchFunc in filters['customMatch']:
-                val = get_item_value(item, fieldName)
-                if matchFunc(val):
-                    keepIt = True
-                    break
+                This is the same as len(...), but is added to be compatible with many server-side ORMs which implement "count" as a function.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              @return <int> - Number of items in this collection
+        '''
+        return len(self)
 
-            for fieldName, value in filters['in']:
-                if get_item_value(item, fieldName) in value:
-                    keepIt = True
-                    break
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+    def sort_by(self, fieldName, reverse=False):
+        '''
+            sort_by - Return a copy of this collection, sorted by the given fieldName.
 
-            for fieldName, value in filters['notin']:
-                if get_item_value(item, fieldName) not in value:
-                    keepIt = True
-                    break
+              The fieldName is accessed the same way as other filtering, so it supports custom properties, etc.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              @param fieldName <str> - The name of the field on which to sort by
 
-            for fieldName, value in filters['eq']:
-                if get_item_value(item, fieldName) == value:
-                    keepIt = True
-                    break
+              @param reverse <bool> Default False - If True, list will be in reverse order.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              @return <QueryableList> - A QueryableList of the same type with the elements sorted based on arguments.
+        '''
+        return self.__class__(
+            sorted(self, key=self._get_field_getter(fieldName), reverse=reverse)
+        )
 
-            for fieldName, value in filters['ieq']:
-                # If we can't lowercase the item's value, it obviously doesn't match whatever we previously could.
-                # Reminder: the "i" filter's values have already been lowercased
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    keepIt = False
-                    break
 
-                if itemValueLower == value:
-                    keepIt = True
-                    break
+    def build_index(self, *fieldNames):
+        '''
+            build_index - Index the values of the given fields, so that "eq" and "is" (and isnull) filters on them
+              through #filterAnd only have to test the items which hold that value, rather than every item.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              Modifying this collection (append, slice assignment, sort, etc.) discards all indexes, the next time it is
+              filtered. Changing the value of an indexed field on one of the items is not noticed (nor is replacing an
+              item with another which compares equal to it), so call build_index again after doing so.
 
-            for fieldName, value in filters['ne']:
-                if get_item_value(item, fieldName) != value:
-                    keepIt = True
-                    break
+            @param fieldNames <str> - One or more names of fields to index
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @raises TypeError - If any value of the given fields is not hashable
+        '''
+        indexes = dict(self._get_indexes() or {})
 
-            for fieldName, value in filters['ine']:
-                itemValue = get_item_value(item, fieldName)
+        for fieldName in fieldNames:
+            getter = self._get_field_getter(fieldName)
+
+            index = {}
+            for idx, item in enumerate(self):
+                itemValue = getter(item)
                 try:
-                    itemValueLower = itemValue.lower()
-                except:
-                    # If we can't convert the field value to lowercase, it does not equal the other.
-                    continue
+                    index[itemValue].append(idx)
+                except KeyError:
+                    index[itemValue] = [idx]
 
-                if itemValueLower != value:
-                    keepIt = True
-                    break
+            indexes[fieldName] = index
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        self._indexes = indexes
+        self._indexedItems = list(self)
 
-            for fieldName, value in filters['lt']:
-                if get_item_value(item, fieldName) < value:
-                    keepIt = True
-                    break
+    def _get_indexes(self):
+        '''
+            _get_indexes - Returns the indexes from #build_index, if the collection has not been modified since they were built.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+              Rather than overriding every list method which modifies the collection (which would slow down those methods
+                for every QueryableList, indexed or not), this compares against a copy of the items taken by #build_index.
+                The comparison runs in C, and an unmodified item compares by identity without calling its __eq__.
 
-            for fieldName, value in filters['lte']:
-                if get_item_value(item, fieldName) <= value:
-                    keepIt = True
-                    break
-
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @return dict/None - The indexes, or None if there are none (or they were discarded)
+        '''
+        indexes = self._indexes
+        if indexes is None:
+            return None
 
-            for fieldName, value in filters['gt']:
-                if get_item_value(item, fieldName) > value:
-                    keepIt = True
-                    break
+        if not list.__eq__(self, self._indexedItems):
+            self._indexes = self._indexedItems = None
+            return None
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        return indexes
 
+    def _get_index_candidates(self, filters):
+        '''
+            _get_index_candidates - Use the indexes from #build_index to find which items could possibly match the
+              "eq" and "is" filters in #filters
 
-            for fieldName, value in filters['gte']:
-                if get_item_value(item, fieldName) >= value:
-                    keepIt = True
-                    break
+                @param filters <dict> - Filters, as returned by getFiltersFromArgs
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @return list<int>/None - Sorted list of the indexes of the candidate items, or None if no index applies.
 
-            for fieldName, value in filters['contains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    continue
-
-            if keepIt is True:
-                ret.append(item)
+              The candidates are a superset of the matches, all the filters still need to be applied to them.
+        '''
+        indexes = self._get_indexes()
+        if not indexes:
+            return None
+
+        postings = []
+        for fieldName, value in filters['eq'] + filters['is']:
+            index = indexes.get(fieldName, None)
+            if index is None:
                 continue
 
-            for fieldName, value in filters['icontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
-
-                    if value in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    continue
-
-            if keepIt is True:
-                ret.append(item)
+            try:
+                postings.append( index.get(value, []) )
+            except TypeError:
+                # Filter value is not hashable, so cannot be looked up. Just filter normally on this field.
                 continue
 
-            for fieldName, value in filters['notcontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    if value not in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    keepIt = True
-                    break
+        if not postings:
+            return None
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        postings.sort(key=len)
+        candidateIdxs = postings[0]
+        for otherIdxs in postings[1:]:
+            if not candidateIdxs:
+                break
+            otherIdxs = set(otherIdxs)
+            candidateIdxs = [ idx for idx in candidateIdxs if idx in otherIdxs ]
 
-            for fieldName, value in filters['noticontains']:
-                itemValue = get_item_value(item, fieldName)
-                try:
-                    itemValue = itemValue.lower()
-
-                    if value not in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not support "in", it does not contain the item.
-                    keepIt = True
-                    break
+        return candidateIdxs
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+    def _apply_filters(self, filterMethod, filters):
+        '''
+            _apply_filters - Filter this collection with filters that have already been parsed, so the same filters
+              can be applied many times (like by QueryBuilder) without being parsed again each time.
 
+                @param filterMethod <str> - FILTER_METHOD_AND or FILTER_METHOD_OR
+                @param filters <dict> - Filters, as returned by getFiltersFromArgs
 
-            for fieldName, value in filters['containsAny']:
-                itemValue = get_item_value(item, fieldName)
+            @return - A QueryableList object of the same type, with only the matching objects returned.
+        '''
+        if filterMethod == FILTER_METHOD_OR:
+            return self.__class__(_filterItemsOr(self, self._get_filter_plan(filters, _FILTER_MATCHERS_OR)))
 
-                if itemValue is None:
-                    # None contains nothing, no match
-                    continue
+        filterPlan = self._get_filter_plan(filters, _FILTER_MATCHERS)
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is True:
-                    keepIt = True
-                    break
+        items = self
+        if self._indexes:
+            candidateIdxs = self._get_index_candidates(filters)
+            if candidateIdxs is not None:
+                items = [ self[idx] for idx in candidateIdxs ]
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        return self.__class__(_filterItemsAnd(items, filterPlan))
 
-            for fieldName, value in filters['notcontainsAny']:
-                itemValue = get_item_value(item, fieldName)
+    def filterAnd(self, **kwargs):
+        '''
+            filter/filterAnd - Performs a filter and returns a QueryableList object of the same type.
 
-                if itemValue is None:
-                    # None contains nothing, so this is a match
-                    keepIt = True
-                    break
+                All the provided filters must match for the item to be returned.
 
-                didContain = False
-                for maybeContains in value:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is False:
-                    keepIt = True
-                    break
+            @params are in the format of fieldName__operation=value  where fieldName is the name of the field on any given item, "operation" is one of the given operations (@see main documentation) (e.x. eq, ne, isnull), and value is what is used in the operation.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @return - A QueryableList object of the same type, with only the matching objects returned.
+        '''
+        return self._apply_filters(FILTER_METHOD_AND, getFiltersFromArgs(kwargs))
 
 
-            for fieldName, value in filters['splitcontains']:
-                (splitBy, maybeContains) = value
+    '''
+        filter - Synonym to '#filterAnd'
 
-                itemValue = get_item_value(item, fieldName)
+        @see #QueryableListBase.filterAnd
+    '''
+    filter = filterAnd
 
-                if itemValue is None:
-                    # Cannot split, no match
-                    continue
+    def filterAndParallel(self, numJobs=None, chunkThreshold=10000, **kwargs):
+        '''
+            filterAndParallel - Performs the same filter as #filterAnd, but splits the collection into chunks
+              which are filtered in parallel by a pool of processes.
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item.
-                    continue
+                The items and filter values must be picklable to be sent to the worker processes (so, for example,
+                  a lambda cannot be used with customMatch), and any subclass must be importable by module.
 
+                This only pays off for large collections or expensive filters, as every item is copied to a worker.
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+            @param numJobs <int/None> Default None - Number of processes to use. None uses the number of CPUs.
 
-            for fieldName, value in filters['splitnotcontains']:
-                (splitBy, maybeContains) = value
+            @param chunkThreshold <int> Default 10000 - If the collection has fewer items than this, no
+              processes are started and this is the same as #filterAnd
 
-                itemValue = get_item_value(item, fieldName)
+            @params - Other params are filters, @see #filterAnd
 
-                if itemValue is None:
-                    # Cannot split, so does not contain and is a match.
-                    keepIt = True
-                    break
+              Because they share the keyword namespace with the filters, "numJobs" and "chunkThreshold" are reserved.
+               To filter on a field with one of those names, give the filter type explicitly (like numJobs__eq=4).
+               A misspelling of either (like numjobs=4) is taken as an "eq" filter on that field, not an error.
 
+            @return - A QueryableList object of the same type, with only the matching objects returned.
+        '''
+        if len(self) < chunkThreshold:
+            return self.filterAnd(**kwargs)
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                    if maybeContains not in itemValue:
-                        keepIt = True
-                        break
-                except:
-                    # If field does not supprt "in", or cannot be split, it does not contain the item and thus matches here.
-                    keepIt = True
-                    break
+        # Raise any errors in the filters here, not in the workers
+        getFiltersFromArgs(kwargs)
 
+        # Imported here so that importing QueryableList does not pay for it
+        import multiprocessing
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        if not numJobs:
+            numJobs = multiprocessing.cpu_count()
 
+        chunkSize = (len(self) // numJobs) + 1
+        chunks = [ (self.__class__, list(self[i : i + chunkSize]), i, kwargs) for i in range(0, len(self), chunkSize) ]
 
-            for fieldName, value in filters['splitcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+        pool = multiprocessing.Pool(numJobs)
+        try:
+            results = pool.map(_filterAndChunk, chunks)
+        finally:
+            pool.terminate()
 
-                itemValue = get_item_value(item, fieldName)
+        return self.__class__([ self[idx] for chunkResults in results for idx in chunkResults ])
 
-                if itemValue is None:
-                    # Cannot split, so it does not contain a match
-                    continue
+    def filterOr(self, **kwargs):
+        '''
+            filterOr - Performs a filter and returns a QueryableList object of the same type.
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, does not match.
-                    continue
+                Anythe provided filters can match for the item to be returned.
 
+            @params are in the format of fieldName__operation=value  where fieldName is the name of the field on any given item, "operation" is one of the given operations (@see main documentation) (e.x. eq, ne, isnull), and value is what is used in the operation.
 
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
+            @return - A QueryableList object of the same type, with only the matching objects returned.
+        '''
+        return self._apply_filters(FILTER_METHOD_OR, getFiltersFromArgs(kwargs))
 
-                if didContain is True:
-                    keepIt = True
-                    break
+    def _ifilter(self, filterMethod, items, kwargs):
+        '''
+            _ifilter - Lazily filter #items, using the field access of this collection
 
+            @see #ifilterAnd
+        '''
+        if filterMethod == FILTER_METHOD_AND:
+            matchers = _FILTER_MATCHERS
+        else:
+            matchers = _FILTER_MATCHERS_OR
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        filterPlan = self._get_filter_plan(getFiltersFromArgs(kwargs), matchers)
 
-            for fieldName, value in filters['splitnotcontainsAny']:
-                (splitBy, maybeContainsLst) = value
+        return QueryableListIterator(self, _ifilterItems(filterMethod, items, filterPlan))
 
-                itemValue = get_item_value(item, fieldName)
+    def ifilterAnd(self, **kwargs):
+        '''
+            ifilter/ifilterAnd - Performs the same filter as #filterAnd, but lazily. Returns a QueryableListIterator,
+              which only tests each item as it is iterated.
 
-                if itemValue is None:
-                    # Cannot split, so it must not contain any (and is a match)
-                    keepIt = True
-                    break
+              The result can be chained with further ifilterAnd/ifilterOr calls without creating any intermediate
+               lists, and collected into a QueryableList of this type with ".all()". It can only be iterated once.
 
-                try:
-                    itemValue = itemValue.split(splitBy)
-                except:
-                    # Cannot split, so must not contain any (and is a match)
-                    keepIt = True
-                    break
+            @params - Filters, @see #filterAnd
 
-                didContain = False
-                for maybeContains in maybeContainsLst:
-                    if maybeContains in itemValue:
-                        didContain = True
-                        break
-                if didContain is False:
-                    keepIt = True
-                    break
+            @return <QueryableListIterator> - Iterator over the matching items
+        '''
+        return self._ifilter(FILTER_METHOD_AND, self, kwargs)
 
+    '''
+        ifilter - Synonym to '#ifilterAnd'
 
-            if keepIt is True:
-                ret.append(item)
-                continue
+        @see #QueryableListBase.ifilterAnd
+    '''
+    ifilter = ifilterAnd
 
+    def ifilterOr(self, **kwargs):
+        '''
+            ifilterOr - Performs the same filter as #filterOr, but lazily.
 
-        return ret
+            @see #ifilterAnd
+        '''
+        return self._ifilter(FILTER_METHOD_OR, self, kwargs)
 
     ################################################
     ##     List overrides to return same type     ##
@@ -1085,5 +1149,63 @@ class QueryableListBase(list):
         return self.__class__(self)
 
 
+class QueryableListIterator(object):
+    '''
+        QueryableListIterator - A lazily filtered set of items, returned by QueryableListBase.ifilterAnd and ifilterOr.
+
+          No filtering happens until this is iterated, and then each item passes through all the chained filters
+            before the next item is fetched, so chaining several filters does not create any intermediate lists.
+
+          Like any iterator, it can only be iterated once.
+    '''
+
+    # One of these is created for every ifilter call, so skip the per-instance __dict__
+    __slots__ = ('queryableList', 'items')
+
+    def __init__(self, queryableList, items):
+        '''
+            __init__ - Create a QueryableListIterator
+
+                @param queryableList <QueryableListBase> - The QueryableList this came from, which provides the field access and the type returned by #all
+                @param items <iterable> - The items
+        '''
+        self.queryableList = queryableList
+        self.items = iter(items)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.items)
+
+    # Python 2
+    next = __next__
+
+    def ifilterAnd(self, **kwargs):
+        '''
+            ifilter/ifilterAnd - Lazily apply another AND filter to these items
+
+            @see QueryableListBase.ifilterAnd
+        '''
+        return self.queryableList._ifilter(FILTER_METHOD_AND, self.items, kwargs)
+
+    ifilter = ifilterAnd
+
+    def ifilterOr(self, **kwargs):
+        '''
+            ifilterOr - Lazily apply an OR filter to these items
+
+            @see QueryableListBase.ifilterOr
+        '''
+        return self.queryableList._ifilter(FILTER_METHOD_OR, self.items, kwargs)
+
+    def all(self):
+        '''
+            all - Collect the (remaining) items into a QueryableList, of the same type this came from
+
+            @return <QueryableListBase> - The matching items
+        '''
+        return self.queryableList.__class__(self.items)
+
 
 #vim: set ts=4 st=4 sw=4 expandtab
@@ -1,8 +1,6 @@
 # Copyright (c) 2016, 2017 Timothy Savannah under the terms of the GNU Lesser General Public License version 2.1.
 #  You should have received a copy of this as "LICENSE" with this source distribution.
 #  The full license is available at https://raw.githubusercontent.com/kata198/QueryableList/master/LICENSE
-#
-# TODO: Add tests for QueryBuilder
 '''
     Builder - Provides "QueryBuilder", which supports building reuaable queries which can be reused and executed
       on datasets.
@@ -28,6 +26,8 @@ class QueryBuilder(object):
         '''
 
     def __init__(self):
+        # filters - Each entry is ( filterMethod, filterArgs, parsedFilters ), where parsedFilters is filterArgs
+        #   already run through getFiltersFromArgs. ( filterMethod, filterArgs ) entries are also accepted.
         self.filters = deque()
 
     def addFilter(self, filterMethod=FILTER_METHOD_AND, **kwargs):
@@ -37,14 +37,17 @@ class QueryBuilder(object):
             @param filterMethod  <str> - The filter method to use (AND or OR), default: 'AND'
             @param additional args - Filter arguments. @see QueryableListBase.filter
 
-            @raises ValueError if filterMethod is not one of known methods.
+            @raises ValueError if filterMethod is not one of known methods, or if any of the filter args are invalid.
 
         '''
         filterMethod = filterMethod.upper()
         if filterMethod not in FILTER_METHODS:
             raise ValueError('Unknown filter method, %s. Must be one of: %s' %(str(filterMethod), repr(FILTER_METHODS)))
 
-        self.filters.append((filterMethod, kwargs))
+        # Parse the filters once here, rather than every time the query is executed
+        parsedFilters = getFiltersFromArgs(kwargs)
+
+        self.filters.append((filterMethod, kwargs, parsedFilters))
 
     def addFilterAnd(self, **kwargs):
         '''
@@ -79,8 +82,13 @@ class QueryBuilder(object):
         filters = copy.copy(self.filters)
         nextFilter = filters.popleft()
         while nextFilter:
-            (filterMethod, filterArgs) = nextFilter
-            lst = self._applyFilter(lst, filterMethod, filterArgs)
+            if len(nextFilter) == 3:
+                (filterMethod, filterArgs, parsedFilters) = nextFilter
+            else:
+                # Not added through addFilter, so not parsed yet
+                (filterMethod, filterArgs) = nextFilter
+                parsedFilters = getFiltersFromArgs(filterArgs)
+            lst = self._applyFilter(lst, filterMethod, filterArgs, parsedFilters)
             if len(lst) == 0:
                 return lst
             try:
@@ -100,18 +108,26 @@ class QueryBuilder(object):
         return ret
 
     @staticmethod
-    def _applyFilter(lst, filterMethod, filterArgs):
+    def _applyFilter(lst, filterMethod, filterArgs, parsedFilters):
         '''
             _applyFilter - Applies the given filter method on a set of args
 
              private method - used by execute
 
+             @param parsedFilters <dict> - #filterArgs already run through getFiltersFromArgs. If #lst does not override
+               the filter method, these are applied directly to save parsing #filterArgs again.
+
              @return QueryableList - a QueryableList containing the elements of the resulting filter
         '''
+        lstClass = lst.__class__
         if filterMethod == FILTER_METHOD_AND:
-            return lst.filterAnd(**filterArgs)
-        else: # ALready validated in addFIlter that type is AND or OR
-            return lst.filterOr(**filterArgs)
+            if lstClass.filterAnd != QueryableListBase.filterAnd:
+                return lst.filterAnd(**filterArgs)
+        else: # Already validated in addFilter that type is AND or OR
+            if lstClass.filterOr != QueryableListBase.filterOr:
+                return lst.filterOr(**filterArgs)
+
+        return lst._apply_filters(filterMethod, parsedFilters)
 
 
 #vim: set ts=4 st=4 sw=4 expandtab
@@ -23,7 +23,7 @@
       Now you support ALL the operations available in QueryableList, acting on your objects!
 '''
 
-__all__ = ('FILTER_TYPES', 'FILTER_METHOD_OR', 'FILTER_METHOD_OR', 'FILTER_METHODS', 'QueryableListObjs', 'QueryableListDicts', 'QueryableListBase', 'QueryableListMixed', 'QueryBuilder')
+__all__ = ('FILTER_TYPES', 'FILTER_METHOD_OR', 'FILTER_METHOD_OR', 'FILTER_METHODS', 'QueryableListObjs', 'QueryableListDicts', 'QueryableListBase', 'QueryableListMixed', 'QueryableListIterator', 'QueryBuilder')
 
 __version__ = '3.1.0'
 __version_tuple__ = (3, 1, 0)
@@ -31,7 +31,7 @@ __version_tuple__ = (3, 1, 0)
 
 from .constants import FILTER_TYPES, FILTER_METHODS, FILTER_METHOD_OR, FILTER_METHOD_OR
 
-from .Base import QueryableListBase
+from .Base import QueryableListBase, QueryableListIterator
 from .Builder import QueryBuilder
 
 
@@ -53,6 +53,19 @@ class QueryableListObjs(QueryableListBase):
         '''
         return getattr(item, fieldName, None)
 
+    def _get_field_getter(self, fieldName):
+        '''
+            _get_field_getter - Returns a function which fetches the value of #fieldName off an item with getattr.
+
+              If a subclass provides its own _get_item_value, that is used instead.
+
+            @see QueryableListBase._get_field_getter
+        '''
+        if self._get_item_value is not QueryableListObjs._get_item_value:
+            return QueryableListBase._get_field_getter(self, fieldName)
+
+        return lambda item : getattr(item, fieldName, None)
+
 
 class QueryableListDicts(QueryableListBase):
     '''
@@ -75,6 +88,24 @@ class QueryableListDicts(QueryableListBase):
             return item[fieldName]
         return None
 
+    def _get_field_getter(self, fieldName):
+        '''
+            _get_field_getter - Returns a function which fetches the value of #fieldName off an item using dict-style access.
+
+              If a subclass provides its own _get_item_value, that is used instead.
+
+            @see QueryableListBase._get_field_getter
+        '''
+        if self._get_item_value is not QueryableListDicts._get_item_value:
+            return QueryableListBase._get_field_getter(self, fieldName)
+
+        def _get_field_value(item):
+            if fieldName in item:
+                return item[fieldName]
+            return None
+
+        return _get_field_value
+
 
 class QueryableListMixed(QueryableListBase):
     '''
@@ -104,4 +135,26 @@ class QueryableListMixed(QueryableListBase):
 
         return QueryableListObjs._get_item_value(item, fieldName)
 
+    def _get_field_getter(self, fieldName):
+        '''
+            _get_field_getter - Returns a function which fetches the value of #fieldName off an item, using either dict-style
+              or attribute access, the same as #_get_item_value.
+
+              If a subclass provides its own _get_item_value, that is used instead.
+
+            @see QueryableListBase._get_field_getter
+        '''
+        if self._get_item_value is not QueryableListMixed._get_item_value:
+            return QueryableListBase._get_field_getter(self, fieldName)
+
+        def _get_field_value(item):
+            if hasattr(item, '__getitem__'):
+                if fieldName in item:
+                    return item[fieldName]
+                return None
+
+            return getattr(item, fieldName, None)
+
+        return _get_field_value
+
 #vim: set ts=4 st=4 sw=4 expandtab
@@ -118,6 +118,44 @@ class TestBasicFiltering(object):
 
         assert ( (found[0].a == 'six' or found[0].b == 'five') or (found[1].a == 'six' or found[1].b == 'five') ) , 'Got wrong items for a="6" and b="five". Got: %s' %(str(found),)
 
+    def test_filterOrIeq(self):
+        # Each ieq filter is tested on its own. A field which cannot be lowercased (or is missing) used to stop
+        #   the other ieq filters from being checked, depending on the order the keyword args were given.
+        qlDicts = QueryableListDicts([ {'a' : None, 'b' : 'X'}, {'a' : 7, 'b' : 'x'}, {'b' : 'y'}, {'a' : 'X', 'b' : 5} ])
+
+        for filterArgs in ( {'a__ieq' : 'x', 'b__ieq' : 'X'}, {'b__ieq' : 'X', 'a__ieq' : 'x'} ):
+            found = qlDicts.filterOr(**filterArgs)
+            assert list(found) == [ qlDicts[0], qlDicts[1], qlDicts[3] ] , 'Expected every ieq filter in filterOr(**%s) to be tested. Got: %s' %(repr(filterArgs), str(found))
+
+    def test_filterKeys(self):
+        qlDicts = QueryableListDicts([ {'a__b' : 'one', 'c' : 1}, {'a__b' : 'two', 'c' : 2} ])
+
+        # Repeat each query, the second time the parsed key comes from the cache
+        for i in range(2):
+            found = qlDicts.filter(a__b__eq='one')
+            assert len(found) == 1 and found[0]['c'] == 1 , 'Expected field name containing "__" to be everything before the last "__". Got: %s' %(str(found), )
+
+            found = qlDicts.filter(c__gt=1)
+            assert len(found) == 1 and found[0]['c'] == 2 , 'Expected c__gt=1 to return one item. Got: %s' %(str(found), )
+
+            gotException = False
+            try:
+                qlDicts.filter(c__notAFilter=1)
+            except ValueError:
+                gotException = True
+
+            assert gotException is True , 'Expected unknown filter type to raise ValueError'
+
+    def test_guardFilters(self):
+        # Comparing None with an int raises on python3, so these rely on the other filter excluding "amy" first
+        qlDicts = QueryableListDicts([ {'name' : 'bob', 'age' : 20}, {'name' : 'amy', 'age' : None}, {'name' : 'Bob', 'age' : 40} ])
+
+        found = qlDicts.filter(name__ieq='BOB', age__lt=30)
+        assert len(found) == 1 and found[0] is qlDicts[0] , 'Expected ieq to be applied before lt. Got: %s' %(str(found), )
+
+        found = qlDicts.filter(age__customMatch=lambda age : age is not None, age__lt=30)
+        assert len(found) == 1 and found[0] is qlDicts[0] , 'Expected customMatch to be applied before lt. Got: %s' %(str(found), )
+
 if __name__ == '__main__':
     sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
 
@@ -0,0 +1,127 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test for the generated filter functions, which filterAnd/filterOr/ifilter use
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts
+from QueryableList import Base as QueryableListBaseModule
+
+from tutils import DataObject
+
+
+class TestCompiledFilters(object):
+
+    def setup_class(self):
+        self.dataObjs = [
+            DataObject(a='one', b='two', num=7),
+            DataObject(a='one', b='five', num=-5),
+            DataObject(a='six', c='eleven', num=7),
+            DataObject(a='six', b='two', num=1),
+            DataObject(a='Seven', b=None, num=100),
+        ]
+
+    def test_orMixed(self):
+        dataObjs = self.dataObjs
+        qlObjs = QueryableListObjs(dataObjs)
+
+        # eq and in are written inline, ieq and containsAny call their matcher, and contains is inline only for str
+        found = qlObjs.filterOr(num=-5, a__ieq='SEVEN')
+        assert list(found) == [ dataObjs[1], dataObjs[4] ] , 'Got wrong items from OR of inline eq and matcher ieq: %s' %(str(found), )
+
+        found = qlObjs.filterOr(c__containsAny=['elev'], num__in=[1], b__contains='iv')
+        assert list(found) == [ dataObjs[1], dataObjs[2], dataObjs[3] ] , 'Got wrong items from OR of inline and matcher filters: %s' %(str(found), )
+
+        found = qlObjs.filterOr(b__contains='w', c__icontains='ELEVEN', a__ne='one')
+        assert list(found) == [ dataObjs[0], dataObjs[2], dataObjs[3], dataObjs[4] ] , 'Got wrong items from OR of inline ne and matcher filters: %s' %(str(found), )
+
+        found = qlObjs.filterOr(num__gt=100, b__icontains='zzz')
+        assert len(found) == 0 , 'Expected OR with nothing matching to return no items. Got: %s' %(str(found), )
+
+    def test_reuseShape(self):
+        dataObjs = self.dataObjs
+        qlObjs = QueryableListObjs(dataObjs)
+
+        compiledFilters = QueryableListBaseModule._COMPILED_FILTERS
+        compiledFilters.clear()
+
+        found = qlObjs.filter(a='one', num__gt=0)
+        assert list(found) == [ dataObjs[0] ] , 'Got wrong items from first query: %s' %(str(found), )
+
+        numCompiled = len(compiledFilters)
+        assert numCompiled == 1 , 'Expected one filter function to be generated. Got: %d' %(numCompiled, )
+
+        # Same shape, different values, must reuse the function with the new values
+        found = qlObjs.filter(a='six', num__gt=5)
+        assert list(found) == [ dataObjs[2] ] , 'Got wrong items from second query of same shape: %s' %(str(found), )
+
+        found = qlObjs.filter(a='six', num__gt=-10)
+        assert list(found) == [ dataObjs[2], dataObjs[3] ] , 'Got wrong items from third query of same shape: %s' %(str(found), )
+
+        assert len(compiledFilters) == numCompiled , 'Expected queries of the same shape to reuse the generated function'
+
+        found = qlObjs.filterOr(a='six', num__gt=5)
+        assert list(found) == [ dataObjs[0], dataObjs[2], dataObjs[3], dataObjs[4] ] , 'Got wrong items from OR query of same filter types: %s' %(str(found), )
+
+        assert len(compiledFilters) == numCompiled + 1 , 'Expected an OR query to generate a different function than an AND query'
+
+    def test_andRejects(self):
+        # Generated AND filters reject an item when the opposite comparison is true, which differs from
+        #   keeping it when the comparison is true for NaN and sets
+        nan = float('nan')
+        items = [ {'n' : nan, 's' : {3}}, {'n' : 3, 's' : {1}}, {'n' : 7, 's' : {1, 2}} ]
+        qlDicts = QueryableListDicts(items)
+
+        for filterArgs, expectedIdxs in (
+                ( {'n__lt' : 5}, [0, 1] ),
+                ( {'n__gte' : 5}, [0, 2] ),
+                ( {'n__gt' : 1, 'n__lte' : 5}, [0, 1] ),
+                ( {'n__ne' : 3, 'n__lt' : 10}, [0, 2] ),
+                ( {'n__eq' : 3}, [1] ),
+                ( {'s__lt' : {1, 2}}, [0, 1] ),
+                ( {'s__gte' : {1, 2}, 'n__is' : nan}, [0] ),
+                ( {'s__gt' : {1}, 's__lte' : {1, 2}}, [0, 2] ),
+            ):
+            expected = [ items[idx] for idx in expectedIdxs ]
+
+            found = qlDicts.filterAnd(**filterArgs)
+            assert list(found) == expected , 'Got wrong items from filterAnd(**%s): %s' %(repr(filterArgs), str(found))
+
+            found = list( qlDicts.ifilterAnd(**filterArgs) )
+            assert found == expected , 'Got wrong items from ifilterAnd(**%s): %s' %(repr(filterArgs), str(found))
+
+    def test_manyFilters(self):
+        numFields = 40
+
+        items = [ dict( [ ('f%d' %(i, ), i + j) for i in range(numFields) ] ) for j in range(3) ]
+        qlDicts = QueryableListDicts(items)
+
+        # Every field matches on the first item (j=0)
+        filterArgs = dict( [ ('f%d' %(i, ), i) for i in range(numFields) ] )
+        found = qlDicts.filter(**filterArgs)
+        assert list(found) == [ items[0] ] , 'Expected %d eq filters to match only the first item. Got: %s' %(numFields, str(found))
+
+        # Only the last filter does not match, on the first item
+        filterArgs['f%d' %(numFields - 1, )] = -1
+        found = qlDicts.filter(**filterArgs)
+        assert len(found) == 0 , 'Expected a failing last eq filter to exclude every item. Got: %s' %(str(found), )
+
+        # Only the last filter matches, on the last item
+        filterArgs = dict( [ ('f%d__gt' %(i, ), 1000) for i in range(numFields - 1) ] )
+        filterArgs['f%d__gt' %(numFields - 1, )] = numFields
+        found = qlDicts.filterOr(**filterArgs)
+        assert list(found) == [ items[2] ] , 'Expected only the last of %d gt filters to match, on the last item. Got: %s' %(numFields, str(found))
+
+        found = list( qlDicts.ifilterOr(**filterArgs) )
+        assert found == [ items[2] ] , 'Expected ifilterOr to match the same as filterOr. Got: %s' %(str(found), )
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
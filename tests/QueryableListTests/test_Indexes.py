@@ -0,0 +1,86 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test for build_index, filtering with an index must always return the same as without
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed
+
+from tutils import DataObject
+
+
+class TestIndexes(object):
+
+    def setup_class(self):
+        self.dataObjs = [
+            DataObject(a='one', b='two', num=7),
+            DataObject(a='one', b='five', num=-5),
+            DataObject(a='six', c='eleven', num=7),
+            DataObject(a='six', b='two', num=1),
+        ]
+
+    def _checkSame(self, qlIndexed, filterArgs, expectedLen):
+        expected = QueryableListObjs(qlIndexed).filterAnd(**filterArgs)
+        found = qlIndexed.filterAnd(**filterArgs)
+
+        assert len(found) == expectedLen , 'Expected %d items from indexed query %s. Got: %d' %(expectedLen, repr(filterArgs), len(found))
+        assert list(found) == list(expected) , 'Expected indexed query %s to return the same items, in order, as without the index' %(repr(filterArgs), )
+
+    def test_indexedFilter(self):
+        qlObjs = QueryableListObjs(self.dataObjs)
+        qlObjs.build_index('a', 'b')
+
+        self._checkSame(qlObjs, {'a' : 'one'}, 2)
+        self._checkSame(qlObjs, {'a' : 'six', 'b' : 'two'}, 1)
+        self._checkSame(qlObjs, {'a' : 'six', 'num__gt' : 0}, 2)
+        self._checkSame(qlObjs, {'b__isnull' : True}, 1)
+        self._checkSame(qlObjs, {'a' : 'nine'}, 0)
+        self._checkSame(qlObjs, {'a' : ['unhashable']}, 0)
+
+        # Not indexed, so filters as normal
+        self._checkSame(qlObjs, {'num' : 7}, 2)
+
+    def test_invalidate(self):
+        qlObjs = QueryableListObjs(self.dataObjs)
+        qlObjs.build_index('a')
+
+        qlObjs.append(DataObject(a='one', num=3))
+        self._checkSame(qlObjs, {'a' : 'one'}, 3)
+
+        qlObjs.build_index('a')
+        qlObjs.sort(key=lambda item : item.num)
+        self._checkSame(qlObjs, {'a' : 'one'}, 3)
+
+        qlObjs.build_index('a')
+        qlObjs[0] = DataObject(a='one')
+        self._checkSame(qlObjs, {'a' : 'one'}, 3)
+
+        qlObjs.build_index('a')
+        del qlObjs[0]
+        self._checkSame(qlObjs, {'a' : 'one'}, 2)
+
+        qlObjs.build_index('a')
+        qlObjs += [ DataObject(a='one') ]
+        self._checkSame(qlObjs, {'a' : 'one'}, 3)
+
+        assert qlObjs._indexes is None , 'Expected indexes to be cleared after modifying the collection'
+
+        # Modifications are noticed even when not made through the QueryableList's own methods
+        qlObjs.build_index('a')
+        list.insert(qlObjs, 0, DataObject(a='one'))
+        self._checkSame(qlObjs, {'a' : 'one'}, 4)
+
+        # Indexing must not come at the cost of the list methods on every QueryableList
+        for methodName in ('append', 'extend', 'insert', 'pop', 'remove', 'sort', 'reverse', '__setitem__', '__delitem__'):
+            assert getattr(QueryableListObjs, methodName) is getattr(list, methodName) , 'Expected QueryableListObjs.%s to be list.%s' %(methodName, methodName)
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
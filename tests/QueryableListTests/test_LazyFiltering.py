@@ -0,0 +1,87 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test for the lazy ifilterAnd / ifilterOr methods, which should always match filterAnd / filterOr
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed, QueryableListIterator
+
+from tutils import DataObject
+
+
+class TestLazyFiltering(object):
+
+    def setup_class(self):
+        self.dataObjs = [
+            DataObject(a='one', b='two', num=7),
+            DataObject(a='one', b='five', num=-5),
+            DataObject(a='six', c='eleven', num=7),
+            DataObject(a='six', b='two', num=1),
+        ]
+
+    def test_ifilter(self):
+        qlObjs = QueryableListObjs(self.dataObjs)
+
+        for filterArgs in ( {'a' : 'one'}, {'a__ne' : 'one', 'num__gt' : 0}, {'b__isnull' : True}, {'c__icontains' : 'EVEN'}, {} ):
+            found = qlObjs.ifilterAnd(**filterArgs)
+            assert isinstance(found, QueryableListIterator) , 'Expected ifilterAnd to return a QueryableListIterator'
+            assert list(found) == list(qlObjs.filterAnd(**filterArgs)) , 'Expected ifilterAnd %s to match filterAnd' %(repr(filterArgs), )
+
+            found = qlObjs.ifilterOr(**filterArgs)
+            assert list(found) == list(qlObjs.filterOr(**filterArgs)) , 'Expected ifilterOr %s to match filterOr' %(repr(filterArgs), )
+
+    def test_chaining(self):
+        qlObjs = QueryableListObjs(self.dataObjs)
+
+        found = qlObjs.ifilter(num__gt=0).ifilterAnd(b='two').all()
+
+        assert found.__class__ == QueryableListObjs , 'Expected all() to return the original type. Got: %s' %(found.__class__.__name__, )
+        assert list(found) == [ self.dataObjs[0], self.dataObjs[3] ] , 'Got wrong items from chained ifilter: %s' %(str(found), )
+
+        found = qlObjs.ifilter(a='six').ifilterOr(num=1, c='eleven').all()
+        assert list(found) == [ self.dataObjs[2], self.dataObjs[3] ] , 'Got wrong items from chained ifilter/ifilterOr: %s' %(str(found), )
+
+    def test_lazy(self):
+        seen = []
+        def recordNum(num):
+            seen.append(num)
+            return True
+
+        qlObjs = QueryableListObjs(self.dataObjs)
+
+        found = qlObjs.ifilter(num__customMatch=recordNum)
+        assert not seen , 'Expected ifilter not to test any items before being iterated'
+
+        assert next(found) is self.dataObjs[0]
+        assert seen == [7] , 'Expected ifilter to only test the items requested. Tested: %s' %(repr(seen), )
+
+        assert next(found) is self.dataObjs[1]
+        assert iter(found) is found , 'Expected QueryableListIterator to be its own iterator'
+        assert list(found) == self.dataObjs[2:] , 'Expected iterating to continue after the items taken with next()'
+
+        gotException = False
+        try:
+            next(found)
+        except StopIteration:
+            gotException = True
+
+        assert gotException is True , 'Expected next() on an exhausted QueryableListIterator to raise StopIteration'
+
+        gotException = False
+        try:
+            qlObjs.ifilter(num__notAFilter=1)
+        except ValueError:
+            gotException = True
+
+        assert gotException is True , 'Expected unknown filter type to raise ValueError when ifilter is called'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
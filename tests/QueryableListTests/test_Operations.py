@@ -177,6 +177,51 @@ class TestOperations(object):
         doTest(qlObjs, 'AND', {'a__ne' : 'one'}, ( dataObjs[2], ) )
         doTest(qlObjs, 'OR', {'b__ne' : 'two', 'num__ne' : -5 }, (dataObjs[0], dataObjs[1], dataObjs[2]) )
 
+    def test_ieq(self):
+        doTest = self._doTest
+
+        # str values, None, a missing field, and values which cannot be lowercased
+        mixedObjs = [
+            DataObject(s='One', num=1),
+            DataObject(s='ONE', num=2),
+            DataObject(s='two', num=3),
+            DataObject(s=None, num=4),
+            DataObject(num=5),
+            DataObject(s=7, num=6),
+            DataObject(s=['one'], num=7),
+        ]
+        qlMixedObjs = QueryableListObjs(mixedObjs)
+
+        doTest(qlMixedObjs, 'AND', {'s__ieq' : 'one'}, (mixedObjs[0], mixedObjs[1]) )
+        doTest(qlMixedObjs, 'AND', {'s__ieq' : 'oNE', 'num__gt' : 1}, (mixedObjs[1], ) )
+        doTest(qlMixedObjs, 'AND', {'s__ieq' : 'three'}, tuple() )
+
+        doTest(qlMixedObjs, 'OR', {'s__ieq' : 'TWO', 'num' : 6}, (mixedObjs[2], mixedObjs[5]) )
+        doTest(qlMixedObjs, 'OR', {'s__ieq' : 'one', 'num__lt' : 0}, (mixedObjs[0], mixedObjs[1]) )
+
+    def test_ine(self):
+        doTest = self._doTest
+
+        mixedObjs = [
+            DataObject(s='One', num=1),
+            DataObject(s='ONE', num=2),
+            DataObject(s='two', num=3),
+            DataObject(s=None, num=4),
+            DataObject(num=5),
+            DataObject(s=7, num=6),
+            DataObject(s=['one'], num=7),
+        ]
+        qlMixedObjs = QueryableListObjs(mixedObjs)
+
+        # Under AND, a value which cannot be lowercased (including None or a missing field) is not equal, so matches
+        doTest(qlMixedObjs, 'AND', {'s__ine' : 'one'}, tuple(mixedObjs[2:]) )
+        doTest(qlMixedObjs, 'AND', {'s__ine' : 'ONE', 'num__lt' : 5}, (mixedObjs[2], mixedObjs[3]) )
+
+        # Under OR, a value which cannot be lowercased has never counted as a match for ine
+        doTest(qlMixedObjs, 'OR', {'s__ine' : 'one'}, (mixedObjs[2], ) )
+        doTest(qlMixedObjs, 'OR', {'s__ine' : 'one', 'num__gte' : 6}, (mixedObjs[2], mixedObjs[5], mixedObjs[6]) )
+        doTest(qlMixedObjs, 'OR', {'s__ine' : 'TWO', 'num' : 4}, (mixedObjs[0], mixedObjs[1], mixedObjs[3]) )
+
     def test_lt(self):
         dataObjs = self.dataObjs
         doTest = self._doTest
@@ -220,8 +265,87 @@ class TestOperations(object):
         doTest(qlObjs, 'AND', {'num__gte' : 7}, (dataObjs[0], dataObjs[2] ) )
         doTest(qlObjs, 'AND', {'num__gte' : -5}, (dataObjs[0], dataObjs[1], dataObjs[2]  ) )
         doTest(qlObjs, 'AND', {'num__gte' : -6}, (dataObjs[0], dataObjs[1], dataObjs[2]  ) )
-        
-        
+
+    def test_partialOrder(self):
+        doTest = self._doTest
+
+        # An AND filter rejects an item when the opposite comparison is true (lt rejects on >=, eq on !=, ...),
+        #   while an OR filter keeps an item when the comparison is true. These differ for NaN and sets.
+        nanObjs = [ DataObject(n=float('nan')), DataObject(n=3) ]
+        qlNanObjs = QueryableListObjs(nanObjs)
+
+        doTest(qlNanObjs, 'AND', {'n__lt' : 5}, tuple(nanObjs) )
+        doTest(qlNanObjs, 'AND', {'n__lte' : 1}, (nanObjs[0], ) )
+        doTest(qlNanObjs, 'AND', {'n__gt' : 5}, (nanObjs[0], ) )
+        doTest(qlNanObjs, 'AND', {'n__gte' : 5}, (nanObjs[0], ) )
+        doTest(qlNanObjs, 'AND', {'n__eq' : 3}, (nanObjs[1], ) )
+        doTest(qlNanObjs, 'AND', {'n__ne' : 3}, (nanObjs[0], ) )
+
+        doTest(qlNanObjs, 'OR', {'n__lt' : 5}, (nanObjs[1], ) )
+        doTest(qlNanObjs, 'OR', {'n__gte' : 5}, tuple() )
+        doTest(qlNanObjs, 'OR', {'n__ne' : 3}, (nanObjs[0], ) )
+
+        setObjs = [ DataObject(n={3}), DataObject(n={1}) ]
+        qlSetObjs = QueryableListObjs(setObjs)
+
+        doTest(qlSetObjs, 'AND', {'n__lt' : {1, 2}}, tuple(setObjs) )
+        doTest(qlSetObjs, 'AND', {'n__gte' : {1, 2}}, (setObjs[0], ) )
+        doTest(qlSetObjs, 'OR', {'n__lt' : {1, 2}}, (setObjs[1], ) )
+        doTest(qlSetObjs, 'OR', {'n__gte' : {1, 2}}, tuple() )
+
+    def test_containsAny(self):
+        dataObjs = self.dataObjs
+        doTest = self._doTest
+
+        qlObjs = QueryableListObjs(dataObjs)
+
+        doTest(qlObjs, 'AND', {'q__containsAny' : ['ch', 'zz']}, (dataObjs[0], dataObjs[1]) )
+        doTest(qlObjs, 'AND', {'q__notcontainsAny' : ['ch', 'zz']}, (dataObjs[2], ) )
+        doTest(qlObjs, 'OR', {'q__containsAny' : ['zz'], 'a__containsAny' : ['ix']}, (dataObjs[2], ) )
+
+        # A generator must be usable for every item, not just the first
+        doTest(qlObjs, 'AND', {'q__containsAny' : (x for x in ('ch', 'zz'))}, (dataObjs[0], dataObjs[1]) )
+
+        setObjs = [
+            DataObject(tags={'red', 'blue'}),
+            DataObject(tags=frozenset(['green'])),
+            DataObject(tags=['red']),
+            DataObject(tags=None),
+        ]
+        qlSetObjs = QueryableListObjs(setObjs)
+
+        doTest(qlSetObjs, 'AND', {'tags__containsAny' : ['red', 'green']}, (setObjs[0], setObjs[1], setObjs[2]) )
+        doTest(qlSetObjs, 'AND', {'tags__containsAny' : ['blue']}, (setObjs[0], ) )
+        doTest(qlSetObjs, 'AND', {'tags__notcontainsAny' : ['red']}, (setObjs[1], setObjs[3]) )
+        doTest(qlSetObjs, 'OR', {'tags__notcontainsAny' : ['red', 'green']}, (setObjs[3], ) )
+
+        # A value which is not iterable is only an error if an item is actually tested against it
+        doTest(QueryableListObjs([ DataObject(tags=None) ]), 'AND', {'tags__containsAny' : 5}, tuple() )
+        doTest(QueryableListObjs([]), 'AND', {'tags__notcontainsAny' : 5}, tuple() )
+
+    def test_contains(self):
+        doTest = self._doTest
+
+        # Mix of str fields and fields which are not str (or do not support "in" at all)
+        mixedObjs = [
+            DataObject(q='cheese'),
+            DataObject(q=['cheese', 'ham']),
+            DataObject(q=None),
+            DataObject(q=7),
+            DataObject(q='ham'),
+        ]
+        qlMixedObjs = QueryableListObjs(mixedObjs)
+
+        doTest(qlMixedObjs, 'AND', {'q__contains' : 'cheese'}, (mixedObjs[0], mixedObjs[1]) )
+        doTest(qlMixedObjs, 'AND', {'q__contains' : 'hee'}, (mixedObjs[0], ) )
+        doTest(qlMixedObjs, 'AND', {'q__notcontains' : 'hee'}, (mixedObjs[1], mixedObjs[2], mixedObjs[3], mixedObjs[4]) )
+        doTest(qlMixedObjs, 'OR', {'q__contains' : 'ham', 'num__contains' : 'x'}, (mixedObjs[1], mixedObjs[4]) )
+
+        # A value which is not a str can only be found in the non-str fields
+        doTest(qlMixedObjs, 'AND', {'q__contains' : 7}, tuple() )
+        doTest(qlMixedObjs, 'AND', {'q__notcontains' : ['cheese']}, tuple(mixedObjs) )
+
+
 if __name__ == '__main__':
     sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
 
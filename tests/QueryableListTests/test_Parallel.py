@@ -0,0 +1,54 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test for filterAndParallel, which should always match filterAnd
+
+'''
+
+import sys
+import subprocess
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed
+
+
+class TestParallel(object):
+
+    def setup_class(self):
+        self.dataDicts = [ { 'a' : ('one', 'two', 'three')[i % 3], 'num' : i, 'b' : (i % 4 and 'x' or None) } for i in range(301) ]
+
+    def test_matchesFilterAnd(self):
+        qlDicts = QueryableListDicts(self.dataDicts)
+
+        for filterArgs in ( {'a' : 'two'}, {'a__ne' : 'one', 'num__gte' : 150}, {'b__isnull' : True, 'a__in' : ['one', 'three']}, {'num__lt' : 0} ):
+            expected = qlDicts.filterAnd(**filterArgs)
+            found = qlDicts.filterAndParallel(numJobs=3, chunkThreshold=0, **filterArgs)
+
+            assert found.__class__ == QueryableListDicts , 'Expected filterAndParallel to return same type. Got: %s' %(found.__class__.__name__, )
+
+            assert len(found) == len(expected) , 'Expected filterAndParallel to return %d items for %s. Got: %d' %(len(expected), repr(filterArgs), len(found))
+
+            for i in range(len(found)):
+                assert found[i] is expected[i] , 'Expected filterAndParallel to return the original items, in order, for %s' %(repr(filterArgs), )
+
+    def test_belowThreshold(self):
+        qlDicts = QueryableListDicts(self.dataDicts)
+
+        # Below the threshold, no processes are used so a lambda is fine
+        found = qlDicts.filterAndParallel(num__customMatch=lambda num : num % 100 == 0)
+
+        assert len(found) == 4 , 'Expected filterAndParallel below threshold to return 4 items. Got: %d' %(len(found), )
+
+    def test_reservedNames(self):
+        qlDicts = QueryableListDicts([ {'numJobs' : i % 2, 'chunkThreshold' : i} for i in range(10) ])
+
+        # Fields named like the control params can still be filtered, by giving the filter type explicitly
+        found = qlDicts.filterAndParallel(numJobs=2, chunkThreshold=0, numJobs__eq=1, chunkThreshold__lt=5)
+
+        assert list(found) == [ qlDicts[1], qlDicts[3] ] , 'Expected explicit filter types to filter fields named numJobs/chunkThreshold. Got: %s' %(str(found), )
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
@@ -0,0 +1,113 @@
+#!/usr/bin/env GoodTests.py
+
+# vim: set ts=4 st=4 sw=4 expandtab :
+'''
+    Test for QueryBuilder
+
+'''
+
+import sys
+import subprocess
+
+from collections import deque
+
+from QueryableList import QueryableListObjs, QueryableListDicts, QueryableListMixed, QueryBuilder
+
+from tutils import DataObject
+
+
+class TestQueryBuilder(object):
+
+    def setup_class(self):
+        self.dataObjs = [
+            DataObject(a='one', b='two', num=7),
+            DataObject(a='one', b='five', num=-5),
+            DataObject(a='six', c='eleven', num=7),
+            DataObject(a='six', b='two', num=1),
+        ]
+
+        self.dataDicts = [ dict(dataObj.__dict__) for dataObj in self.dataObjs ]
+
+    def test_execute(self):
+        query = QueryBuilder()
+        query.addFilterAnd(num__gt=0, a__in=(x for x in ('one', 'six')))
+        query.addFilterOr(b='two', c__icontains='EVEN')
+
+        # Execute several times, on different types, to make sure the filters are reusable
+        for i in range(2):
+            found = query.execute(QueryableListObjs(self.dataObjs))
+            assert found.__class__ == QueryableListObjs , 'Expected execute to return the provided type. Got: %s' %(found.__class__.__name__, )
+            assert list(found) == [ self.dataObjs[0], self.dataObjs[2], self.dataObjs[3] ] , 'Got wrong items from query on objects: %s' %(str(found), )
+
+            found = query.execute(self.dataDicts)
+            assert found.__class__ == QueryableListMixed , 'Expected execute on a list to return QueryableListMixed. Got: %s' %(found.__class__.__name__, )
+            assert list(found) == [ self.dataDicts[0], self.dataDicts[2], self.dataDicts[3] ] , 'Got wrong items from query on dicts: %s' %(str(found), )
+
+    def test_copy(self):
+        query = QueryBuilder()
+        query.addFilter('AND', a='one')
+
+        queryCopy = query.copy()
+        queryCopy.addFilter('AND', num__lt=0)
+
+        assert len(query.execute(QueryableListObjs(self.dataObjs))) == 2 , 'Expected adding to a copy not to modify the original query'
+        assert list(queryCopy.execute(QueryableListObjs(self.dataObjs))) == [ self.dataObjs[1] ] , 'Expected copy to have filters from both the original and those added after'
+
+    def test_editFilters(self):
+        query = QueryBuilder()
+        query.addFilterAnd(a='one')
+        query.addFilterAnd(num__lt=0)
+
+        # Changes to the filters deque, however they are made, must be used by execute
+        query.filters.pop()
+        found = query.execute(QueryableListObjs(self.dataObjs))
+        assert list(found) == [ self.dataObjs[0], self.dataObjs[1] ] , 'Expected execute to use the filters remaining after pop. Got: %s' %(str(found), )
+
+        query.filters = deque([ ('AND', {'a' : 'six'}), ('OR', {'b' : 'two', 'num__lt' : 0}) ])
+        found = query.execute(QueryableListObjs(self.dataObjs))
+        assert list(found) == [ self.dataObjs[3] ] , 'Expected execute to use ( filterMethod, filterArgs ) entries set directly on filters. Got: %s' %(str(found), )
+
+    def test_subclassFilter(self):
+        calls = []
+
+        class QueryableListLoggedObjs(QueryableListObjs):
+
+            def filterAnd(self, **kwargs):
+                calls.append( ('AND', kwargs) )
+                return QueryableListObjs.filterAnd(self, **kwargs)
+
+            def filterOr(self, **kwargs):
+                calls.append( ('OR', kwargs) )
+                return QueryableListObjs.filterOr(self, **kwargs)
+
+        query = QueryBuilder()
+        query.addFilterAnd(a='one')
+        query.addFilterOr(num__lt=0, b='two')
+
+        found = query.execute(QueryableListLoggedObjs(self.dataObjs))
+        assert list(found) == [ self.dataObjs[0], self.dataObjs[1] ] , 'Got wrong items from query on subclass: %s' %(str(found), )
+        assert calls == [ ('AND', {'a' : 'one'}), ('OR', {'num__lt' : 0, 'b' : 'two'}) ] , 'Expected execute to call filterAnd/filterOr overridden by a subclass. Calls: %s' %(repr(calls), )
+
+    def test_invalid(self):
+        query = QueryBuilder()
+
+        for filterMethod, filterArgs in ( ('XOR', {'a' : 'one'}), ('AND', {'a__notAFilter' : 'one'}), ('OR', {'a__isnull' : 'yes'}) ):
+            gotException = False
+            try:
+                query.addFilter(filterMethod, **filterArgs)
+            except ValueError:
+                gotException = True
+
+            assert gotException is True , 'Expected addFilter(%s, %s) to raise ValueError' %(repr(filterMethod), repr(filterArgs))
+
+        assert len(query.filters) == 0 , 'Expected invalid filters not to be added'
+
+        # Not iterable, but only an error if an item is tested against it (like filterAnd)
+        query.addFilter('AND', c__containsAny=5)
+        assert len(query.execute(QueryableListObjs(self.dataObjs[:2]))) == 0 , 'Expected no items with a "c" field to match'
+
+
+if __name__ == '__main__':
+    sys.exit(subprocess.Popen('GoodTests.py -n1 "%s" %s' %(sys.argv[0], ' '.join(['"%s"' %(arg.replace('"', '\\"'), ) for arg in sys.argv[1:]]) ), shell=True).wait())
+
+# vim: set ts=4 st=4 sw=4 expandtab :
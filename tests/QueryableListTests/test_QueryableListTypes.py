@@ -103,6 +103,48 @@ class TestQueryableListTypes(object):
         assert gotException is False, 'Got Exception for QueryableListMixed on dicts when should not have: %s%s' %(str(type(e)), str(e)) 
         assert len(found) == 2, 'Did not find correct number of items'
 
+    def test_subclassGetItemValue(self):
+
+        class QueryableListUpperObjs(QueryableListObjs):
+
+            @staticmethod
+            def _get_item_value(item, fieldName):
+                return getattr(item, fieldName.upper(), None)
+
+        class QueryableListUpperDicts(QueryableListDicts):
+
+            def _get_item_value(self, item, fieldName):
+                return item.get(fieldName.upper(), None)
+
+        upperObjs = QueryableListUpperObjs([DataObject(A='one'), DataObject(A='two'), DataObject(a='one')])
+        found = upperObjs.filter(a='one')
+        assert len(found) == 1 and found[0] is upperObjs[0], 'Expected filter to use _get_item_value from subclass of QueryableListObjs'
+
+        upperDicts = QueryableListUpperDicts([{'A' : 'one'}, {'A' : 'two'}, {'a' : 'one'}])
+        found = upperDicts.filterOr(a='one', b='two')
+        assert len(found) == 1 and found[0] is upperDicts[0], 'Expected filterOr to use _get_item_value from subclass of QueryableListDicts'
+
+    def test_fieldFetchedOnce(self):
+
+        class QueryableListCountingDicts(QueryableListDicts):
+
+            def _get_item_value(self, item, fieldName):
+                self.fetched.append(fieldName)
+                return item.get(fieldName, None)
+
+        data = QueryableListCountingDicts([{'num' : 5, 'a' : 'one'}, {'num' : 50, 'a' : 'two'}, {'num' : 500, 'a' : 'three'}])
+
+        for filterMethod, filterArgs, expectedIdxs in (
+                ( 'filterAnd', {'num__gt' : 1, 'num__lt' : 100, 'num__ne' : 5, 'a__contains' : 't'}, [1] ),
+                ( 'filterOr', {'num__gt' : 100, 'num__lt' : 10, 'a__ieq' : 'TWO'}, [0, 1, 2] ),
+                ( 'filterOr', {'num__gt' : 1000, 'num__lt' : 1}, [] ),
+            ):
+            data.fetched = []
+            found = getattr(data, filterMethod)(**filterArgs)
+
+            assert list(found) == [ data[idx] for idx in expectedIdxs ] , 'Got wrong items from %s(**%s): %s' %(filterMethod, repr(filterArgs), repr(found))
+            assert data.fetched.count('num') <= len(data) , 'Expected "num" to be fetched at most once per item with several filters on it. Got %d fetches for %d items' %(data.fetched.count('num'), len(data))
+
 
 
 